@@ -10,18 +10,86 @@ Licencia: MIT
 
 import os
 import sys
+import glob
 import json
 import platform
 import datetime
 import hashlib
+import functools
 import subprocess
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 try:
     import psutil
 except ImportError:
     print("Error: psutil no está instalado. Ejecuta: pip install psutil")
     sys.exit(1)
 
+# Archivos críticos del sistema recopilados en cada análisis
+CRITICAL_FILES = (
+    '/etc/passwd',
+    '/etc/shadow',
+    '/etc/group',
+    '/etc/hosts',
+    '/etc/hostname',
+    '/etc/resolv.conf',
+    '/etc/fstab',
+    '/etc/crontab',
+    '/var/log/auth.log',
+    '/var/log/syslog',
+    '/var/log/messages',
+    '/var/log/secure',
+    '/home/*/.bash_history',
+    '/root/.bash_history'
+)
+
+# Tamaño de bloque para el cálculo de hashes (evita cargar logs enteros en RAM)
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Buffer de escritura para volcados JSON
+JSON_WRITE_BUFFER_SIZE = 64 * 1024
+
+# Hilos usados para calcular hashes de archivos en paralelo
+HASH_WORKERS = min(4, os.cpu_count() or 1)
+
+def sha256_file(file_path):
+    """Calcula el SHA256 de un archivo leyéndolo por bloques"""
+    sha256 = hashlib.sha256()
+    buffer = bytearray(HASH_CHUNK_SIZE)
+    view = memoryview(buffer)
+    with open(file_path, 'rb', buffering=0) as f:
+        _fadvise(f.fileno(), 'POSIX_FADV_SEQUENTIAL')
+        while True:
+            size = f.readinto(buffer)
+            if not size:
+                break
+            sha256.update(view[:size])
+    return sha256.hexdigest()
+
+def _fadvise(fd, advice):
+    """Aplica posix_fadvise sobre todo el archivo si la plataforma lo soporta"""
+    if hasattr(os, 'posix_fadvise') and hasattr(os, advice):
+        try:
+            os.posix_fadvise(fd, 0, 0, getattr(os, advice))
+        except OSError:
+            pass
+
+@functools.lru_cache(maxsize=1)
+def get_python_architecture():
+    """Arquitectura del intérprete (platform.architecture() invoca `file` por subprocess)"""
+    return platform.architecture()[0]
+
+def write_json(file_path, data):
+    """Guarda datos en JSON (UTF-8, indentado) con un formato idéntico en toda instalación"""
+    # json.dump emite miles de fragmentos pequeños: un buffer de 64 KiB los agrupa
+    with open(file_path, 'w', encoding='utf-8', buffering=JSON_WRITE_BUFFER_SIZE) as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+def read_json(file_path):
+    """Carga un archivo JSON de casos o evidencia"""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
 class LinuxSystemAnalyzer:
     """Analizador del sistema Linux para recopilación forense"""
     
@@ -32,11 +100,23 @@ class LinuxSystemAnalyzer:
         self.installed_packages = []
         self.system_files = []
         self.users_info = []
+        self._package_manager = None
+        
+    def _detect_package_manager(self):
+        """Detecta el gestor de paquetes una sola vez por analizador"""
+        if self._package_manager is None:
+            self._package_manager = ''
+            for manager in ('dpkg', 'rpm', 'pacman'):
+                if os.path.exists(f'/usr/bin/{manager}'):
+                    self._package_manager = manager
+                    break
+        return self._package_manager
         
     def get_system_information(self):
         """Recopila información básica del sistema Linux"""
         try:
             uname = platform.uname()
+            memory = psutil.virtual_memory()
             self.system_info = {
                 'hostname': uname.node,
                 'system': uname.system,
@@ -44,12 +124,12 @@ class LinuxSystemAnalyzer:
                 'version': uname.version,
                 'machine': uname.machine,
                 'processor': uname.processor,
-                'architecture': platform.architecture()[0],
+                'architecture': get_python_architecture(),
                 'python_version': platform.python_version(),
                 'boot_time': datetime.datetime.fromtimestamp(psutil.boot_time()).isoformat(),
                 'cpu_count': psutil.cpu_count(),
-                'memory_total': psutil.virtual_memory().total,
-                'memory_available': psutil.virtual_memory().available,
+                'memory_total': memory.total,
+                'memory_available': memory.available,
                 'disk_usage': {}
             }
             
@@ -77,9 +157,9 @@ class LinuxSystemAnalyzer:
                 try:
                     proc_info = proc.info
                     proc_info['create_time'] = datetime.datetime.fromtimestamp(proc_info['create_time']).isoformat()
-                    proc_info['memory_rss'] = proc_info['memory_info'].rss if proc_info['memory_info'] else 0
-                    proc_info['memory_vms'] = proc_info['memory_info'].vms if proc_info['memory_info'] else 0
-                    del proc_info['memory_info']  # Remover objeto no serializable
+                    memory_info = proc_info.pop('memory_info')  # Remover objeto no serializable
+                    proc_info['memory_rss'] = memory_info.rss if memory_info else 0
+                    proc_info['memory_vms'] = memory_info.vms if memory_info else 0
                     self.processes.append(proc_info)
                 except (psutil.NoSuchProcess, psutil.AccessDenied):
                     continue
@@ -106,7 +186,8 @@ class LinuxSystemAnalyzer:
         """Recopila paquetes instalados (dpkg/rpm/pacman)"""
         try:
             # Detectar gestor de paquetes
-            if os.path.exists('/usr/bin/dpkg'):
+            package_manager = self._detect_package_manager()
+            if package_manager == 'dpkg':
                 # Debian/Ubuntu
                 result = subprocess.run(['dpkg', '-l'], capture_output=True, text=True)
                 lines = result.stdout.split('\n')[5:]  # Saltar headers
@@ -119,7 +200,7 @@ class LinuxSystemAnalyzer:
                                 'version': parts[2],
                                 'description': ' '.join(parts[3:]) if len(parts) > 3 else ''
                             })
-            elif os.path.exists('/usr/bin/rpm'):
+            elif package_manager == 'rpm':
                 # RedHat/CentOS/Fedora
                 result = subprocess.run(['rpm', '-qa', '--queryformat', '%{NAME} %{VERSION} %{SUMMARY}\n'], capture_output=True, text=True)
                 for line in result.stdout.split('\n'):
@@ -131,7 +212,7 @@ class LinuxSystemAnalyzer:
                                 'version': parts[1],
                                 'description': parts[2] if len(parts) > 2 else ''
                             })
-            elif os.path.exists('/usr/bin/pacman'):
+            elif package_manager == 'pacman':
                 # Arch Linux
                 result = subprocess.run(['pacman', '-Q'], capture_output=True, text=True)
                 for line in result.stdout.split('\n'):
@@ -148,55 +229,46 @@ class LinuxSystemAnalyzer:
             
     def get_system_files(self):
         """Recopila archivos críticos del sistema Linux"""
-        critical_files = [
-            '/etc/passwd',
-            '/etc/shadow',
-            '/etc/group',
-            '/etc/hosts',
-            '/etc/hostname',
-            '/etc/resolv.conf',
-            '/etc/fstab',
-            '/etc/crontab',
-            '/var/log/auth.log',
-            '/var/log/syslog',
-            '/var/log/messages',
-            '/var/log/secure',
-            '/home/*/.bash_history',
-            '/root/.bash_history'
-        ]
-        
-        for file_path in critical_files:
-            try:
-                if '*' in file_path:
-                    # Manejar wildcards
-                    import glob
-                    for actual_file in glob.glob(file_path):
-                        self._add_file_info(actual_file)
-                else:
-                    self._add_file_info(file_path)
-            except Exception as e:
-                continue
+        try:
+            # El hashing libera el GIL, por lo que los archivos se procesan en paralelo;
+            # map() conserva el orden de CRITICAL_FILES en el resultado
+            with ThreadPoolExecutor(max_workers=HASH_WORKERS) as executor:
+                for file_info in executor.map(self._get_file_info, self._iter_critical_files()):
+                    if file_info:
+                        self.system_files.append(file_info)
+        except Exception as e:
+            print(f"Error recopilando archivos críticos: {e}")
+            
+    def _iter_critical_files(self):
+        """Expande CRITICAL_FILES, incluidos los patrones con wildcards"""
+        for file_path in CRITICAL_FILES:
+            if '*' in file_path:
+                # Manejar wildcards (iglob evita materializar la lista completa)
+                yield from glob.iglob(file_path)
+            else:
+                yield file_path
                 
-    def _add_file_info(self, file_path):
-        """Añade información de un archivo específico"""
+    def _get_file_info(self, file_path):
+        """Obtiene la información de un archivo específico (None si no es accesible)"""
         try:
-            if os.path.exists(file_path):
-                stat = os.stat(file_path)
-                with open(file_path, 'rb') as f:
-                    content_hash = hashlib.sha256(f.read()).hexdigest()
-                    
-                self.system_files.append({
-                    'path': file_path,
-                    'size': stat.st_size,
-                    'modified': datetime.datetime.fromtimestamp(stat.st_mtime).isoformat(),
-                    'accessed': datetime.datetime.fromtimestamp(stat.st_atime).isoformat(),
-                    'permissions': oct(stat.st_mode)[-3:],
-                    'owner_uid': stat.st_uid,
-                    'group_gid': stat.st_gid,
-                    'sha256': content_hash
-                })
-        except (PermissionError, OSError):
-            pass
+            # Un único stat(); FileNotFoundError (OSError) cubre el caso inexistente
+            stat = os.stat(file_path)
+            content_hash = sha256_file(file_path)
+
+            return {
+                'path': file_path,
+                'size': stat.st_size,
+                'modified': datetime.datetime.fromtimestamp(stat.st_mtime).isoformat(),
+                'accessed': datetime.datetime.fromtimestamp(stat.st_atime).isoformat(),
+                'permissions': oct(stat.st_mode)[-3:],
+                'owner_uid': stat.st_uid,
+                'group_gid': stat.st_gid,
+                'sha256': content_hash
+            }
+        except Exception:
+            # Un archivo problemático (sin permisos, mtime fuera de rango...)
+            # no debe interrumpir la recopilación del resto
+            return None
             
     def get_users_info(self):
         """Recopila información de usuarios del sistema"""
@@ -214,14 +286,16 @@ class LinuxSystemAnalyzer:
             if os.path.exists('/etc/passwd'):
                 with open('/etc/passwd', 'r') as f:
                     for line in f:
-                        if line.strip() and not line.startswith('#'):
-                            parts = line.strip().split(':')
+                        line = line.strip()
+                        if line and not line.startswith('#'):
+                            parts = line.split(':')
                             if len(parts) >= 7:
+                                uid = int(parts[2])
                                 # Solo usuarios con UID >= 1000 (usuarios normales)
-                                if int(parts[2]) >= 1000 or int(parts[2]) == 0:
+                                if uid >= 1000 or uid == 0:
                                     self.users_info.append({
                                         'username': parts[0],
-                                        'uid': int(parts[2]),
+                                        'uid': uid,
                                         'gid': int(parts[3]),
                                         'home_dir': parts[5],
                                         'shell': parts[6],
@@ -230,27 +304,37 @@ class LinuxSystemAnalyzer:
         except Exception as e:
             print(f"Error recopilando información de usuarios: {e}")
             
+    def _run_step(self, message, step):
+        """Ejecuta un paso de recopilación anunciándolo al comenzar"""
+        print(message)
+        step()
+        
     def collect_all_evidence(self):
         """Recopila toda la evidencia del sistema"""
         print("🔍 Iniciando recopilación de evidencia del sistema Linux...")
         
-        print("📊 Recopilando información del sistema...")
-        self.get_system_information()
-        
-        print("🔄 Analizando procesos en ejecución...")
-        self.get_running_processes()
-        
-        print("🌐 Recopilando conexiones de red...")
-        self.get_network_connections()
-        
-        print("📦 Analizando paquetes instalados...")
-        self.get_installed_packages()
-        
-        print("📂 Recopilando archivos críticos del sistema...")
-        self.get_system_files()
-        
-        print("👥 Analizando información de usuarios...")
-        self.get_users_info()
+        # La evidencia volátil se recopila primero y en serie, antes de que la
+        # herramienta lance subprocesos propios (dpkg/rpm, file) o hilos de hashing
+        volatile_steps = [
+            ("🔄 Analizando procesos en ejecución...", self.get_running_processes),
+            ("🌐 Recopilando conexiones de red...", self.get_network_connections),
+            ("👥 Analizando información de usuarios...", self.get_users_info),
+            ("📊 Recopilando información del sistema...", self.get_system_information)
+        ]
+        for message, step in volatile_steps:
+            self._run_step(message, step)
+        
+        # Paquetes y hashing están limitados por subprocesos y E/S y llenan
+        # atributos distintos, por lo que se solapan una vez tomada la evidencia volátil
+        bulk_steps = [
+            ("📦 Analizando paquetes instalados...", self.get_installed_packages),
+            ("📂 Recopilando archivos críticos del sistema...", self.get_system_files)
+        ]
+        with ThreadPoolExecutor(max_workers=len(bulk_steps)) as executor:
+            futures = [executor.submit(self._run_step, message, step)
+                       for message, step in bulk_steps]
+            for future in futures:
+                future.result()
         
         print("✅ Recopilación de evidencia completada.")
         
@@ -272,6 +356,7 @@ class CaseManager:
         self.cases_dir = self.workspace_dir / "cases"
         self.evidence_dir = self.workspace_dir / "evidence"
         self.reports_dir = self.workspace_dir / "reports"
+        self._case_cache = {}  # nombre de archivo -> ((mtime_ns, tamaño), datos del caso)
         
         # Crear directorios si no existen
         for directory in [self.workspace_dir, self.cases_dir, self.evidence_dir, self.reports_dir]:
@@ -279,21 +364,22 @@ class CaseManager:
             
     def create_case(self, case_name, investigator, description=""):
         """Crea un nuevo caso forense"""
-        case_id = f"CASE_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        # Un único instante para el ID y la fecha de creación del caso
+        now = datetime.datetime.now()
+        case_id = f"CASE_{now.strftime('%Y%m%d_%H%M%S')}"
         case_data = {
             'case_id': case_id,
             'case_name': case_name,
             'investigator': investigator,
             'description': description,
-            'created': datetime.datetime.now().isoformat(),
+            'created': now.isoformat(),
             'status': 'active',
             'evidence_files': [],
             'chain_of_custody': []
         }
         
         case_file = self.cases_dir / f"{case_id}.json"
-        with open(case_file, 'w', encoding='utf-8') as f:
-            json.dump(case_data, f, indent=2, ensure_ascii=False)
+        write_json(case_file, case_data)
             
         print(f"✅ Caso creado: {case_id}")
         return case_id
@@ -303,13 +389,68 @@ class CaseManager:
         cases = []
         for case_file in self.cases_dir.glob("CASE_*.json"):
             try:
-                with open(case_file, 'r', encoding='utf-8') as f:
-                    case_data = json.load(f)
-                    cases.append(case_data)
+                # Reutilizar el caso ya parseado mientras el archivo no cambie
+                stat = case_file.stat()
+                signature = (stat.st_mtime_ns, stat.st_size)
+                cached = self._case_cache.get(case_file.name)
+                if cached is None or cached[0] != signature:
+                    cached = (signature, read_json(case_file))
+                    self._case_cache[case_file.name] = cached
+                cases.append(cached[1])
             except Exception as e:
                 print(f"Error leyendo caso {case_file}: {e}")
         return cases
 
+# Plantillas de filas del reporte HTML (se rellenan con str.format_map)
+PROCESS_ROW_TEMPLATE = """
+                <tr>
+                    <td>{pid}</td>
+                    <td>{name}</td>
+                    <td>{username}</td>
+                    <td>{status}</td>
+                    <td>{memory_mb}</td>
+                    <td>{create_time}</td>
+                </tr>
+"""
+
+CONNECTION_ROW_TEMPLATE = """
+                <tr>
+                    <td>{type}</td>
+                    <td>{local_address}</td>
+                    <td>{remote_address}</td>
+                    <td>{status}</td>
+                    <td>{pid}</td>
+                </tr>
+"""
+
+PACKAGE_ROW_TEMPLATE = """
+                <tr>
+                    <td>{name}</td>
+                    <td>{version}</td>
+                    <td>{description}</td>
+                </tr>
+"""
+
+FILE_ROW_TEMPLATE = """
+                <tr>
+                    <td>{path}</td>
+                    <td>{size_kb} KB</td>
+                    <td>{modified}</td>
+                    <td>{permissions}</td>
+                    <td>{sha256}</td>
+                </tr>
+"""
+
+def truncate(text, length):
+    """Recorta un texto a `length` caracteres añadiendo '...' solo si se recortó"""
+    return text if len(text) <= length else text[:length] + '...'
+
+class ReportRow(dict):
+    """Fila de reporte: los campos ausentes se muestran como 'N/A'"""
+    
+    def __missing__(self, key):
+        return 'N/A'
+
 class ReportGenerator:
     """Generador de reportes forenses"""
     
@@ -319,10 +460,11 @@ class ReportGenerator:
         
     def generate_html_report(self, evidence_data, case_id):
         """Genera reporte HTML profesional"""
-        timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
+        now = datetime.datetime.now()
+        timestamp = now.strftime('%Y%m%d_%H%M%S')
         report_file = self.reports_dir / f"report_{case_id}_{timestamp}.html"
         
-        html_content = f"""
+        html_parts = [f"""
 <!DOCTYPE html>
 <html lang="es">
 <head>
@@ -394,23 +536,14 @@ class ReportGenerator:
                     <th>Memoria (MB)</th>
                     <th>Tiempo de Inicio</th>
                 </tr>
-"""
+"""]
         
         # Agregar procesos (limitado a los primeros 50 para evitar reportes muy largos)
         for proc in evidence_data['processes'][:50]:
             memory_mb = proc.get('memory_rss', 0) // (1024*1024)
-            html_content += f"""
-                <tr>
-                    <td>{proc.get('pid', 'N/A')}</td>
-                    <td>{proc.get('name', 'N/A')}</td>
-                    <td>{proc.get('username', 'N/A')}</td>
-                    <td>{proc.get('status', 'N/A')}</td>
-                    <td>{memory_mb}</td>
-                    <td>{proc.get('create_time', 'N/A')}</td>
-                </tr>
-"""
+            html_parts.append(PROCESS_ROW_TEMPLATE.format_map(ReportRow(proc, memory_mb=memory_mb)))
         
-        html_content += f"""
+        html_parts.append(f"""
             </table>
         </div>
         
@@ -425,21 +558,13 @@ class ReportGenerator:
                     <th>Estado</th>
                     <th>PID</th>
                 </tr>
-"""
+""")
         
         # Agregar conexiones de red
         for conn in evidence_data['network_connections'][:30]:
-            html_content += f"""
-                <tr>
-                    <td>{conn.get('type', 'N/A')}</td>
-                    <td>{conn.get('local_address', 'N/A')}</td>
-                    <td>{conn.get('remote_address', 'N/A')}</td>
-                    <td>{conn.get('status', 'N/A')}</td>
-                    <td>{conn.get('pid', 'N/A')}</td>
-                </tr>
-"""
+            html_parts.append(CONNECTION_ROW_TEMPLATE.format_map(ReportRow(conn)))
         
-        html_content += f"""
+        html_parts.append(f"""
             </table>
         </div>
         
@@ -455,19 +580,14 @@ class ReportGenerator:
                     <th>Versión</th>
                     <th>Descripción</th>
                 </tr>
-"""
+""")
         
         # Agregar paquetes instalados (limitado)
         for pkg in evidence_data['installed_packages'][:20]:
-            html_content += f"""
-                <tr>
-                    <td>{pkg.get('name', 'N/A')}</td>
-                    <td>{pkg.get('version', 'N/A')}</td>
-                    <td>{pkg.get('description', 'N/A')[:100]}...</td>
-                </tr>
-"""
+            description = truncate(pkg.get('description', 'N/A'), 100)
+            html_parts.append(PACKAGE_ROW_TEMPLATE.format_map(ReportRow(pkg, description=description)))
         
-        html_content += f"""
+        html_parts.append(f"""
             </table>
         </div>
         
@@ -482,37 +602,30 @@ class ReportGenerator:
                     <th>Permisos</th>
                     <th>SHA256</th>
                 </tr>
-"""
+""")
         
         # Agregar archivos del sistema
         for file_info in evidence_data['system_files']:
             size_kb = file_info.get('size', 0) // 1024
-            html_content += f"""
-                <tr>
-                    <td>{file_info.get('path', 'N/A')}</td>
-                    <td>{size_kb} KB</td>
-                    <td>{file_info.get('modified', 'N/A')}</td>
-                    <td>{file_info.get('permissions', 'N/A')}</td>
-                    <td>{file_info.get('sha256', 'N/A')[:16]}...</td>
-                </tr>
-"""
+            sha256 = truncate(file_info.get('sha256', 'N/A'), 16)
+            html_parts.append(FILE_ROW_TEMPLATE.format_map(ReportRow(file_info, size_kb=size_kb, sha256=sha256)))
         
-        html_content += f"""
+        html_parts.append(f"""
             </table>
         </div>
         
         <div class="footer">
             <p>🔍 <strong>ForenseCTL Linux</strong> - Sistema de Análisis Forense Digital</p>
-            <p>Reporte generado automáticamente el {datetime.datetime.now().strftime('%d/%m/%Y a las %H:%M:%S')}</p>
+            <p>Reporte generado automáticamente el {now.strftime('%d/%m/%Y a las %H:%M:%S')}</p>
             <p>⚖️ Este reporte es para uso profesional en análisis forense digital autorizado</p>
         </div>
     </div>
 </body>
 </html>
-"""
+""")
         
         with open(report_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+            f.write(''.join(html_parts))
             
         print(f"📄 Reporte HTML generado: {report_file}")
         return report_file
@@ -522,8 +635,7 @@ class ReportGenerator:
         timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
         report_file = self.reports_dir / f"evidence_{case_id}_{timestamp}.json"
         
-        with open(report_file, 'w', encoding='utf-8') as f:
-            json.dump(evidence_data, f, indent=2, ensure_ascii=False)
+        write_json(report_file, evidence_data)
             
         print(f"📋 Reporte JSON generado: {report_file}")
         return report_file
@@ -575,7 +687,7 @@ def main():
     
     case_manager = CaseManager()
     analyzer = LinuxSystemAnalyzer()
-    report_generator = ReportGenerator()
+    report_generator = ReportGenerator(case_manager.reports_dir)
     
     current_case = None
     
@@ -585,10 +697,10 @@ def main():
             
             if option == '1':
                 # Gestión de Casos
-                print("\n📁 GESTIÓN DE CASOS")
-                print("[1] Crear nuevo caso")
-                print("[2] Listar casos existentes")
-                print("[3] Seleccionar caso activo")
+                print("\n📁 GESTIÓN DE CASOS\n"
+                      "[1] Crear nuevo caso\n"
+                      "[2] Listar casos existentes\n"
+                      "[3] Seleccionar caso activo")
                 
                 case_option = input("Selecciona una opción: ")
                 
@@ -601,18 +713,16 @@ def main():
                 elif case_option == '2':
                     cases = case_manager.list_cases()
                     if cases:
-                        print("\nCasos disponibles:")
-                        for case in cases:
-                            print(f"- {case['case_id']}: {case['case_name']} ({case['status']})")
+                        print("\nCasos disponibles:\n" + "\n".join(
+                            f"- {case['case_id']}: {case['case_name']} ({case['status']})" for case in cases))
                     else:
                         print("No hay casos disponibles.")
                         
                 elif case_option == '3':
                     cases = case_manager.list_cases()
                     if cases:
-                        print("\nCasos disponibles:")
-                        for i, case in enumerate(cases):
-                            print(f"[{i+1}] {case['case_id']}: {case['case_name']}")
+                        print("\nCasos disponibles:\n" + "\n".join(
+                            f"[{i+1}] {case['case_id']}: {case['case_name']}" for i, case in enumerate(cases)))
                         try:
                             selection = int(input("Selecciona un caso: ")) - 1
                             if 0 <= selection < len(cases):
@@ -631,11 +741,11 @@ def main():
                     print("❌ Primero debes crear o seleccionar un caso.")
                     continue
                     
-                print(f"\n🔍 ANÁLISIS FORENSE - Caso: {current_case}")
-                print("[1] Análisis completo del sistema")
-                print("[2] Análisis de procesos")
-                print("[3] Análisis de red")
-                print("[4] Análisis de paquetes")
+                print(f"\n🔍 ANÁLISIS FORENSE - Caso: {current_case}\n"
+                      "[1] Análisis completo del sistema\n"
+                      "[2] Análisis de procesos\n"
+                      "[3] Análisis de red\n"
+                      "[4] Análisis de paquetes")
                 
                 analysis_option = input("Selecciona una opción: ")
                 
@@ -645,15 +755,13 @@ def main():
                     
                     # Guardar evidencia
                     timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
-                    evidence_file = Path(f"./forensics_workspace/evidence/evidence_{current_case}_{timestamp}.json")
-                    evidence_file.parent.mkdir(parents=True, exist_ok=True)
+                    evidence_file = case_manager.evidence_dir / f"evidence_{current_case}_{timestamp}.json"
                     
-                    with open(evidence_file, 'w', encoding='utf-8') as f:
-                        json.dump(evidence, f, indent=2, ensure_ascii=False)
+                    write_json(evidence_file, evidence)
                     
                     print(f"💾 Evidencia guardada: {evidence_file}")
                     
-                elif analysis_option in ['2', '3', '4']:
+                elif analysis_option in {'2', '3', '4'}:
                     print("🔄 Ejecutando análisis específico...")
                     if analysis_option == '2':
                         analyzer.get_running_processes()
@@ -673,29 +781,28 @@ def main():
                     
                 print(f"\n📄 GENERACIÓN DE REPORTES - Caso: {current_case}")
                 
-                # Buscar archivos de evidencia del caso actual
-                evidence_files = list(Path("./forensics_workspace/evidence").glob(f"evidence_{current_case}_*.json"))
+                # Buscar el archivo de evidencia más reciente del caso actual.
+                # El nombre termina en %Y%m%d_%H%M%S, por lo que el orden
+                # lexicográfico es cronológico y no hace falta stat() por archivo.
+                evidence_files = case_manager.evidence_dir.glob(f"evidence_{current_case}_*.json")
+                latest_evidence = max(evidence_files, key=lambda x: x.name, default=None)
                 
-                if not evidence_files:
+                if latest_evidence is None:
                     print("❌ No hay evidencia disponible. Primero ejecuta un análisis.")
                     continue
-                    
-                # Usar el archivo de evidencia más reciente
-                latest_evidence = max(evidence_files, key=lambda x: x.stat().st_mtime)
                 
-                with open(latest_evidence, 'r', encoding='utf-8') as f:
-                    evidence_data = json.load(f)
+                evidence_data = read_json(latest_evidence)
                     
-                print("[1] Generar reporte HTML")
-                print("[2] Generar reporte JSON")
-                print("[3] Generar ambos reportes")
+                print("[1] Generar reporte HTML\n"
+                      "[2] Generar reporte JSON\n"
+                      "[3] Generar ambos reportes")
                 
                 report_option = input("Selecciona una opción: ")
                 
-                if report_option in ['1', '3']:
+                if report_option in {'1', '3'}:
                     report_generator.generate_html_report(evidence_data, current_case)
                     
-                if report_option in ['2', '3']:
+                if report_option in {'2', '3'}:
                     report_generator.generate_json_report(evidence_data, current_case)
                     
             elif option == '4':
@@ -705,10 +812,10 @@ def main():
                 
             elif option == '5':
                 # Configuración
-                print("\n⚙️ CONFIGURACIÓN Y HERRAMIENTAS")
-                print("[1] Verificar dependencias")
-                print("[2] Información del sistema")
-                print("[3] Limpiar archivos temporales")
+                print("\n⚙️ CONFIGURACIÓN Y HERRAMIENTAS\n"
+                      "[1] Verificar dependencias\n"
+                      "[2] Información del sistema\n"
+                      "[3] Limpiar archivos temporales")
                 
                 config_option = input("Selecciona una opción: ")
                 